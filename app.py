@@ -1,17 +1,75 @@
+import gc
+import os
+
 from flask import Flask, jsonify, request, render_template_string
 # Update imports from the renamed file
 from fuzzifying_parts import (
     get_best_part_recommendation,
+    build_capability_vectors,
     fuzzify_gpu_data,
     fuzzify_cpu_data,
     fuzzify_mb_data
 )
+from fuzzy_logic_recommender import get_reco_score
 from gpu_data import gpu_dataset
 from cpu_data import cpu_dataset
 from motherboard_data import motherboard_dataset
 
 app = Flask(__name__)
 
+# Share of the user's total budget allocated to each part type
+GPU_BUDGET_RATIO = 0.45
+CPU_BUDGET_RATIO = 0.30
+MB_BUDGET_RATIO = 0.25
+
+# --- Part Catalog ---
+# Part type -> (dataset, function returning the part's (performance, resolution) capability scores)
+PART_CATALOG = {
+    'GPU': (gpu_dataset, lambda part: (fuzzify_gpu_data(part)[1], fuzzify_gpu_data(part)[2])),
+    'CPU': (cpu_dataset, fuzzify_cpu_data),
+    'MB': (motherboard_dataset, lambda part: (fuzzify_mb_data(part)[1], fuzzify_mb_data(part)[2])),
+}
+
+# Part type -> {model: capability scores}, built on first use or by preload()
+CAPABILITY_VECTORS = {}
+
+
+def capability_lookup(part_type):
+    """
+    Returns a fuzzification function that reads the precomputed capability scores
+    of a catalog part instead of fuzzifying its specs on every request.
+    """
+    if part_type not in CAPABILITY_VECTORS:
+        dataset, fuzzification_func = PART_CATALOG[part_type]
+        CAPABILITY_VECTORS[part_type] = build_capability_vectors(dataset, fuzzification_func)
+
+    vectors = CAPABILITY_VECTORS[part_type]
+    return lambda part: vectors[part['model']]
+
+
+def preload():
+    """
+    Builds the catalog's capability vectors and warms up the compiled fuzzy system,
+    then moves everything allocated so far out of the garbage collector's reach.
+    Meant for the master process of a pre-forking server (e.g. gunicorn --preload):
+    forked workers then share these pages copy-on-write instead of each building
+    their own copy, and the collector never touches (and so never dirties) them.
+    """
+    for part_type in PART_CATALOG:
+        capability_lookup(part_type)
+
+    # First simulation run allocates skfuzzy's per-simulation state
+    get_reco_score(50, 50, 50)
+
+    gc.collect()
+    gc.freeze()
+
+
+# Set FUZZY_PRELOAD=1 when the server imports the app in its master before forking, e.g.
+#   FUZZY_PRELOAD=1 gunicorn --preload -w 8 app:app
+if os.environ.get('FUZZY_PRELOAD') == '1':
+    preload()
+
 
 # --- API Endpoint to run Fuzzy Logic ---
 @app.route('/recommend', methods=['POST'])
@@ -42,9 +100,6 @@ def recommend_parts():
     # Define the number of recommendations you want
     NUM_RECOMMENDATIONS = 3
 
-    GPU_BUDGET_RATIO = 0.45
-    CPU_BUDGET_RATIO = 0.30
-    MB_BUDGET_RATIO = 0.25
     # User's total budget
     total_budget = user_inputs_clean['budget']
 
@@ -62,7 +117,7 @@ def recommend_parts():
     ranked_gpus = get_best_part_recommendation(
         user_inputs_clean,
         gpu_dataset,
-        lambda part: (fuzzify_gpu_data(part)[1], fuzzify_gpu_data(part)[2]),
+        capability_lookup('GPU'),
         'gpu'
     )
 
@@ -70,7 +125,7 @@ def recommend_parts():
     ranked_cpus = get_best_part_recommendation(
         user_inputs_clean,
         cpu_dataset,
-        fuzzify_cpu_data,
+        capability_lookup('CPU'),
         'CPU'
     )
 
@@ -78,7 +133,7 @@ def recommend_parts():
     ranked_mb = get_best_part_recommendation(
         user_inputs_clean,
         motherboard_dataset,
-        lambda part: (fuzzify_mb_data(part)[1], fuzzify_mb_data(part)[2]),
+        capability_lookup('MB'),
         'MB'
     )
 
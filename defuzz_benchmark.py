@@ -0,0 +1,140 @@
+"""
+Speed vs. ranking-agreement report for the fuzzy system's universe resolution
+and defuzzification method.
+
+FUZZY_UOD_STEP and FUZZY_DEFUZZ_METHOD are read when fuzzy_logic_recommender is
+imported, so every configuration is run in its own process. Each run ranks the
+real datasets for a grid of user inputs, and the rankings are compared against
+the default configuration (step 1, centroid).
+
+Usage:
+    python defuzz_benchmark.py
+    python defuzz_benchmark.py --configs centroid:1 centroid:5 analytic:1 --budget-step 250
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Default deployment settings every other configuration is compared against
+BASELINE_CONFIG = 'centroid:1'
+DEFAULT_CONFIGS = ['centroid:1', 'centroid:2', 'centroid:5', 'bisector:1', 'mom:1', 'analytic:1']
+
+TOP_N = 3
+
+
+def run_rankings(budget_step):
+    """
+    Ranks every dataset for every user input on the grid with the configuration
+    of the current process.
+    :param budget_step: dollar spacing of the budget grid
+    :return: (elapsed seconds, number of parts scored, {case key: [(model, reco_score), ...]})
+    """
+    from app import GPU_BUDGET_RATIO, CPU_BUDGET_RATIO, MB_BUDGET_RATIO
+    from fuzzifying_parts import (
+        get_best_part_recommendation,
+        fuzzify_gpu_data,
+        fuzzify_cpu_data,
+        fuzzify_mb_data
+    )
+    from gpu_data import gpu_dataset
+    from cpu_data import cpu_dataset
+    from cpu_data2 import cpu_dataset as cpu_dataset2
+    from motherboard_data import motherboard_dataset
+
+    datasets = [
+        ('gpu', gpu_dataset, lambda part: fuzzify_gpu_data(part)[1:], 'GPU'),
+        ('cpu', cpu_dataset, fuzzify_cpu_data, 'CPU'),
+        ('cpu2', cpu_dataset2, fuzzify_cpu_data, 'CPU'),
+        ('mb', motherboard_dataset, lambda part: fuzzify_mb_data(part)[1:], 'MB'),
+    ]
+
+    rankings = {}
+    parts_scored = 0
+    start = time.perf_counter()
+    for total_budget in range(500, 3001, budget_step):
+        for performance in (1, 4, 7, 10):
+            for resolution in (1, 2, 3):
+                user_inputs = {
+                    'budget': total_budget,
+                    'performance_priority': performance,
+                    'resolution_level': resolution,
+                    'allocated_gpu_budget': total_budget * GPU_BUDGET_RATIO,
+                    'allocated_cpu_budget': total_budget * CPU_BUDGET_RATIO,
+                    'allocated_mb_budget': total_budget * MB_BUDGET_RATIO,
+                }
+                for name, dataset, fuzzification_func, part_type in datasets:
+                    ranked = get_best_part_recommendation(user_inputs, dataset, fuzzification_func, part_type)
+                    key = f"{name}|{total_budget}|{performance}|{resolution}"
+                    rankings[key] = [(part['model'], part['reco_score']) for part in ranked]
+                    parts_scored += len(dataset)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, parts_scored, rankings
+
+
+def run_config(config, budget_step):
+    """Runs one 'method:step' configuration in a child process and returns its results."""
+    method, step = config.split(':')
+    env = dict(os.environ, FUZZY_DEFUZZ_METHOD=method, FUZZY_UOD_STEP=step)
+    output = subprocess.run(
+        [sys.executable, __file__, '--worker', '--budget-step', str(budget_step)],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def compare(baseline, result):
+    """
+    Compares one configuration's rankings against the baseline.
+    :return: (max absolute reco_score difference, top-1 agreement, top-N agreement) as fractions
+    """
+    max_delta = 0.0
+    top1_same = 0
+    topn_same = 0
+    for key, base_ranked in baseline['rankings'].items():
+        ranked = result['rankings'][key]
+        base_scores = dict(base_ranked)
+        for model, score in ranked:
+            max_delta = max(max_delta, abs(score - base_scores[model]))
+
+        base_models = [model for model, _ in base_ranked]
+        models = [model for model, _ in ranked]
+        top1_same += models[0] == base_models[0]
+        topn_same += models[:TOP_N] == base_models[:TOP_N]
+
+    cases = len(baseline['rankings'])
+    return max_delta, top1_same / cases, topn_same / cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--configs', nargs='+', default=DEFAULT_CONFIGS,
+                        help="configurations to compare, as 'method:uod_step'")
+    parser.add_argument('--budget-step', type=int, default=100,
+                        help="dollar spacing of the budget grid (500-3000)")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        elapsed, parts_scored, rankings = run_rankings(args.budget_step)
+        print(json.dumps({'seconds': elapsed, 'parts_scored': parts_scored, 'rankings': rankings}))
+        return
+
+    baseline = run_config(BASELINE_CONFIG, args.budget_step)
+    print(f"{len(baseline['rankings'])} ranking cases, {baseline['parts_scored']} parts scored per configuration")
+    print(f"Baseline: {BASELINE_CONFIG}\n")
+    print(f"{'config':<14}{'us/part':>10}{'speedup':>10}{'max |delta|':>14}{'top-1 same':>12}{f'top-{TOP_N} same':>12}")
+
+    for config in args.configs:
+        result = baseline if config == BASELINE_CONFIG else run_config(config, args.budget_step)
+        max_delta, top1, topn = compare(baseline, result)
+        per_part_us = 1e6 * result['seconds'] / result['parts_scored']
+        speedup = baseline['seconds'] / result['seconds']
+        print(f"{config:<14}{per_part_us:>10.1f}{speedup:>9.1f}x{max_delta:>14.4f}{top1:>12.1%}{topn:>12.1%}")
+
+
+if __name__ == '__main__':
+    main()
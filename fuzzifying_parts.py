@@ -168,6 +168,15 @@ def fuzzify_mb_data(mb_data):
 
     return budget_score, perf_score, resolution_score
 
+def build_capability_vectors(part_dataset, fuzzification_func):
+    """
+    Precomputes the CAPABILITY scores of every part in a dataset, so requests don't re-fuzzify the specs.
+    :param part_dataset:
+    :param fuzzification_func: returns (perf_score, resolution_score) for a part
+    :return: {model: (perf_score, resolution_score)}
+    """
+    return {part['model']: tuple(fuzzification_func(part)) for part in part_dataset}
+
 def get_best_part_recommendation(user_inputs, part_dataset, fuzzification_func, part_type='CPU', part_price_key='price_usd'):
     """
     Calculates the final recommendation score for any part type based on user inputs.
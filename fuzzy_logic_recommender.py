@@ -1,3 +1,5 @@
+import os
+
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
@@ -7,6 +9,21 @@ import matplotlib.pyplot as plt
 MIN_BUDGET = 500 # Minimum dollar amount for a functional PC
 MAX_BUDGET = 3000 # Maximum high-end dollar amount the system considers 'high'
 
+# --- CONFIGURATION: Fuzzy system resolution and defuzzification ---
+# Both can be set per deployment through environment variables.
+#   FUZZY_UOD_STEP: spacing of the sampled 0-100 universe (default 1, i.e. 101 points)
+#   FUZZY_DEFUZZ_METHOD: 'centroid' (default), 'bisector', 'mom' (mean of maximum),
+#       or 'analytic' (exact centroid of the piecewise-linear sets, bypasses skfuzzy)
+DEFUZZ_METHODS = ('centroid', 'bisector', 'mom', 'analytic')
+
+UOD_STEP = float(os.environ.get('FUZZY_UOD_STEP', 1))
+DEFUZZ_METHOD = os.environ.get('FUZZY_DEFUZZ_METHOD', 'centroid')
+
+if not 0 < UOD_STEP <= 50:
+    raise ValueError(f"FUZZY_UOD_STEP must be in (0, 50], got {UOD_STEP}")
+if DEFUZZ_METHOD not in DEFUZZ_METHODS:
+    raise ValueError(f"FUZZY_DEFUZZ_METHOD must be one of {DEFUZZ_METHODS}, got '{DEFUZZ_METHOD}'")
+
 
 # -------------------------------------------------
 # Budget normalization
@@ -37,7 +54,8 @@ def normalize_budget(dollar_value):
 #       Take crisp inputs and convert them into fuzzy sets.
 # -------------------------------------------------
 
-UOD = np.arange(0, 101, 1)
+# Sample the 0-100 universe at the configured step (linspace keeps 0 and 100 as exact end points)
+UOD = np.linspace(0, 100, int(round(100 / UOD_STEP)) + 1)
 
 # --- Antecedent (Input) Variables ---
 
@@ -49,7 +67,11 @@ performance_priority = ctrl.Antecedent(UOD, 'performance_priority')
 preferred_resolution = ctrl.Antecedent(UOD, 'preferred_resolution')
 
 # --- Consequent (Output) Variable ---
-recommendation_score = ctrl.Consequent(UOD, 'recommendation_score')
+# The analytic mode does its own defuzzification, so skfuzzy keeps centroid for it
+recommendation_score = ctrl.Consequent(
+    UOD, 'recommendation_score',
+    defuzzify_method='centroid' if DEFUZZ_METHOD == 'analytic' else DEFUZZ_METHOD
+)
 
 
 # -------------------------------------------------
@@ -57,26 +79,42 @@ recommendation_score = ctrl.Consequent(UOD, 'recommendation_score')
 #       Create Membership Functions for each variable
 #       Using triangular membership functions for simplicity
 #       Parameters are [start, peak, end] of the triangle
+#       and [start, left peak, right peak, end] of the trapezoid
+#       Kept as plain numbers so the analytic mode can evaluate them without a universe
 # -------------------------------------------------
 
-# Input Membership Functions
-budget['low'] = fuzz.trapmf(UOD, [0, 0, 25, 50])
-budget['medium'] = fuzz.trimf(UOD, [25, 50, 75])
-budget['high'] = fuzz.trapmf(UOD, [50, 75, 100, 100])
-
-performance_priority['low'] = fuzz.trapmf(UOD, [0, 0, 20, 50])
-performance_priority['medium'] = fuzz.trimf(UOD, [20, 50, 80])
-performance_priority['high'] = fuzz.trapmf(UOD, [50, 80, 100, 100])
-
-preferred_resolution['low'] = fuzz.trapmf(UOD, [0, 0, 30, 60])
-preferred_resolution['medium'] = fuzz.trimf(UOD, [30, 60, 90])
-preferred_resolution['high'] = fuzz.trapmf(UOD, [60, 90, 100, 100])
-
-# Output Membership Functions (Recommendation Score)
-recommendation_score['poor'] = fuzz.trapmf(UOD, [0, 0, 10, 30])
-recommendation_score['average'] = fuzz.trimf(UOD, [10, 40, 70])
-recommendation_score['high'] = fuzz.trimf(UOD, [40, 75, 95])
-recommendation_score['excellent'] = fuzz.trapmf(UOD, [70, 95, 100, 100])
+MEMBERSHIP_PARAMS = {
+    # Input Membership Functions
+    'budget': {
+        'low': [0, 0, 25, 50],
+        'medium': [25, 50, 75],
+        'high': [50, 75, 100, 100],
+    },
+    'performance_priority': {
+        'low': [0, 0, 20, 50],
+        'medium': [20, 50, 80],
+        'high': [50, 80, 100, 100],
+    },
+    'preferred_resolution': {
+        'low': [0, 0, 30, 60],
+        'medium': [30, 60, 90],
+        'high': [60, 90, 100, 100],
+    },
+    # Output Membership Functions (Recommendation Score)
+    'recommendation_score': {
+        'poor': [0, 0, 10, 30],
+        'average': [10, 40, 70],
+        'high': [40, 75, 95],
+        'excellent': [70, 95, 100, 100],
+    },
+}
+
+for fuzzy_var in (budget, performance_priority, preferred_resolution, recommendation_score):
+    for term_label, params in MEMBERSHIP_PARAMS[fuzzy_var.label].items():
+        if len(params) == 3:
+            fuzzy_var[term_label] = fuzz.trimf(UOD, params)
+        else:
+            fuzzy_var[term_label] = fuzz.trapmf(UOD, params)
 
 
 
@@ -151,7 +189,126 @@ reco_ctrl = ctrl.ControlSystem(rules)
 reco_sim = ctrl.ControlSystemSimulation(reco_ctrl)
 
 # -------------------------------------------------
-# 5. Defuzzification and Simulation
+# 5. Analytic Evaluation (FUZZY_DEFUZZ_METHOD='analytic')
+#   Same Mamdani inference as skfuzzy (min for AND, max accumulation, clip implication)
+#   computed directly from the membership parameters. Every set is piecewise linear,
+#   so the aggregated output is too and its centroid can be integrated exactly.
+# -------------------------------------------------
+
+# Rules compiled down to ((variable, term), ...) -> output term, read from the skfuzzy rules above
+COMPILED_RULES = [
+    (
+        tuple((term.parent.label, term.label) for term in rule.antecedent_terms),
+        rule.consequent[0].term.label
+    )
+    for rule in rules
+]
+
+
+def _trapezoid_points(params):
+    """Returns [start, left peak, right peak, end] for a triangle or trapezoid."""
+    if len(params) == 3:
+        return params[0], params[1], params[1], params[2]
+    return tuple(params)
+
+
+def _membership(x, points):
+    """Degree of membership of crisp value x in a triangle/trapezoid."""
+    a, b, c, d = points
+    if x < a or x > d:
+        return 0.0
+    if x < b:
+        return (x - a) / (b - a)
+    if x <= c:
+        return 1.0
+    return (d - x) / (d - c)
+
+
+def _analytic_centroid(activations):
+    """
+    Exact centroid of the clipped output sets aggregated with max.
+    :param activations: {output term label: firing strength}
+    :return:
+    """
+    clipped = [
+        (_trapezoid_points(MEMBERSHIP_PARAMS['recommendation_score'][term_label]), level)
+        for term_label, level in activations.items() if level > 0
+    ]
+    if not clipped:
+        raise ValueError("Total area is zero in defuzzification!")
+
+    # Break points: set corners plus where each set reaches its clip level.
+    # Between two consecutive break points every clipped set is linear.
+    break_points = {0.0, 100.0}
+    for (a, b, c, d), level in clipped:
+        break_points.update((a, b, c, d))
+        if b > a:
+            break_points.add(a + level * (b - a))
+        if d > c:
+            break_points.add(d - level * (d - c))
+    break_points = sorted(x for x in break_points if 0 <= x <= 100)
+
+    def clipped_values(x):
+        return [min(level, _membership(x, points)) for points, level in clipped]
+
+    # Add the points where two clipped sets cross, where the max switches sets
+    xs = [break_points[0]]
+    for x0, x1 in zip(break_points, break_points[1:]):
+        v0, v1 = clipped_values(x0), clipped_values(x1)
+        crossings = []
+        for i in range(len(clipped)):
+            for j in range(i + 1, len(clipped)):
+                d0, d1 = v0[i] - v0[j], v1[i] - v1[j]
+                if d0 * d1 < 0:
+                    crossings.append(x0 + (x1 - x0) * d0 / (d0 - d1))
+        xs.extend(sorted(crossings))
+        xs.append(x1)
+
+    # Integrate the piecewise-linear aggregate exactly
+    ys = [max(clipped_values(x)) for x in xs]
+    area = 0.0
+    moment = 0.0
+    for x0, x1, y0, y1 in zip(xs, xs[1:], ys, ys[1:]):
+        width = x1 - x0
+        area += width * (y0 + y1) / 2
+        moment += width * (x0 * (2 * y0 + y1) + x1 * (y0 + 2 * y1)) / 6
+
+    if area == 0:
+        raise ValueError("Total area is zero in defuzzification!")
+    return moment / area
+
+
+def analytic_reco_score(budget_value, perf_value, resolution_value):
+    """
+    Computes the recommendation score without sampling a universe.
+    :param budget_value:
+    :param perf_value:
+    :param resolution_value:
+    :return:
+    """
+    crisp_inputs = {
+        'budget': min(100.0, max(0.0, budget_value)),
+        'performance_priority': min(100.0, max(0.0, perf_value)),
+        'preferred_resolution': min(100.0, max(0.0, resolution_value)),
+    }
+
+    # Fuzzify the crisp inputs
+    memberships = {}
+    for var_label, value in crisp_inputs.items():
+        for term_label, params in MEMBERSHIP_PARAMS[var_label].items():
+            memberships[(var_label, term_label)] = _membership(value, _trapezoid_points(params))
+
+    # Fire the rules: AND with min, accumulate per output term with max
+    activations = dict.fromkeys(MEMBERSHIP_PARAMS['recommendation_score'], 0.0)
+    for antecedent, output_term in COMPILED_RULES:
+        firing = min(memberships[key] for key in antecedent)
+        if firing > activations[output_term]:
+            activations[output_term] = firing
+
+    return _analytic_centroid(activations)
+
+# -------------------------------------------------
+# 6. Defuzzification and Simulation
 #   Create a function to use the system
 #   Takes the fuzzy output and converts back to a single, crisp number
 # -------------------------------------------------
@@ -165,6 +322,9 @@ def get_reco_score(budget_value, perf_value, resolution_value):
     :return:
     """
     try:
+        if DEFUZZ_METHOD == 'analytic':
+            return analytic_reco_score(budget_value, perf_value, resolution_value)
+
         reco_sim.input['budget'] = budget_value
         reco_sim.input['performance_priority'] = perf_value
         reco_sim.input['preferred_resolution'] = resolution_value
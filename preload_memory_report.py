@@ -0,0 +1,146 @@
+"""
+Per-worker memory report for a pre-forking deployment, with and without preload().
+
+Each mode runs in its own process acting as the server master. It forks the
+workers, and every worker serves a batch of /recommend requests through Flask's
+test client. Memory is read from /proc/<pid>/smaps_rollup (Linux only) while all
+workers are still alive:
+    RSS  - resident pages, shared or not (what `ps` shows)
+    PSS  - resident pages with shared pages split between the processes sharing them
+    USS  - pages private to the worker, i.e. what each extra worker really costs
+
+Usage:
+    python preload_memory_report.py
+    python preload_memory_report.py --workers 8 --requests 50
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+def read_memory_kb(pid):
+    """Returns {'rss', 'pss', 'uss'} in kB for a process, from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as smaps:
+        for line in smaps:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'uss': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+def serve_requests(num_requests):
+    """Sends a spread of user inputs to /recommend, like a worker would see in production."""
+    from app import app
+
+    client = app.test_client()
+    for i in range(num_requests):
+        payload = {
+            'budget': 500 + (i * 137) % 2501,
+            'performance': 1 + i % 10,
+            'aesthetics': 1 + i % 3,
+        }
+        response = client.post('/recommend', json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(f"/recommend failed with {response.status_code}: {response.get_data(as_text=True)}")
+
+
+def run_master(use_preload, num_workers, num_requests):
+    """
+    Acts as the server master: optionally preloads, forks the workers and measures them.
+    :return: {'master': memory, 'workers': [memory, ...]}
+    """
+    if use_preload:
+        import app
+        app.preload()
+
+    workers = []
+    for _ in range(num_workers):
+        ready_read, ready_write = os.pipe()
+        exit_read, exit_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # Worker: serve requests, report ready, then stay alive until measured
+            os.close(ready_read)
+            os.close(exit_write)
+            status = 0
+            try:
+                serve_requests(num_requests)
+                os.write(ready_write, b'1')
+                os.read(exit_read, 1)
+            except BaseException as e:
+                print(f"Worker {os.getpid()} failed: {e}", file=sys.stderr)
+                status = 1
+            os._exit(status)
+
+        os.close(ready_write)
+        os.close(exit_read)
+        workers.append((pid, ready_read, exit_write))
+
+    for pid, ready_read, _ in workers:
+        if os.read(ready_read, 1) != b'1':
+            raise RuntimeError(f"Worker {pid} exited before serving its requests")
+
+    report = {
+        'master': read_memory_kb(os.getpid()),
+        'workers': [read_memory_kb(pid) for pid, _, _ in workers],
+    }
+
+    for pid, _, exit_write in workers:
+        os.write(exit_write, b'1')
+        os.waitpid(pid, 0)
+
+    return report
+
+
+def run_mode(use_preload, num_workers, num_requests):
+    """Runs one mode in a fresh interpreter so nothing is imported before the fork by accident."""
+    command = [sys.executable, __file__, '--master',
+               '--workers', str(num_workers), '--requests', str(num_requests)]
+    if use_preload:
+        command.append('--preload')
+
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help="number of forked workers")
+    parser.add_argument('--requests', type=int, default=20, help="/recommend requests served by each worker")
+    parser.add_argument('--master', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--preload', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.master:
+        print(json.dumps(run_master(args.preload, args.workers, args.requests)))
+        return
+
+    print(f"{args.workers} workers, {args.requests} requests each (memory in MB)\n")
+    print(f"{'mode':<12}{'master RSS':>12}{'worker RSS':>12}{'worker PSS':>12}{'worker USS':>12}{'total PSS':>12}")
+
+    results = {}
+    for mode, use_preload in (('no preload', False), ('preload', True)):
+        report = run_mode(use_preload, args.workers, args.requests)
+        workers = report['workers']
+
+        def average_mb(key):
+            return sum(worker[key] for worker in workers) / len(workers) / 1024
+
+        total_pss = (report['master']['pss'] + sum(worker['pss'] for worker in workers)) / 1024
+        results[mode] = average_mb('uss')
+        print(f"{mode:<12}{report['master']['rss'] / 1024:>12.1f}{average_mb('rss'):>12.1f}"
+              f"{average_mb('pss'):>12.1f}{average_mb('uss'):>12.1f}{total_pss:>12.1f}")
+
+    print(f"\nPrivate memory per worker: {results['no preload']:.1f} MB -> {results['preload']:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()